@@ -14,6 +14,9 @@ from transfold.modules.mccaskill import McCaskill
 INPUT_PATH = Path("tests/data/test_sequence_data/").absolute()
 OUTPUT_PATH = Path("tests/data/structure_data").absolute()
 REF_PATH = Path("tests/data/test_structure_data/").absolute()
+SINGLE_PASS_REF_PATH = Path(
+    "tests/data/test_structure_data_single_pass/"
+).absolute()
 LOGS_PATH = Path("tests/logs").absolute()
 MIN_LOOP_LENGTH = 1
 BP_ENERGY_WEIGHT = -1
@@ -449,3 +452,155 @@ def test_create_probability_tables():
             ]
         ),
     )
+
+
+def test_calc_scores_numpy():
+    calculator = McCaskill(
+        input=INPUT_PATH,
+        output=OUTPUT_PATH,
+        bp_energy_weight=BP_ENERGY_WEIGHT,
+        normalized_rt=NORMALIZED_RT,
+        min_loop_length=MIN_LOOP_LENGTH,
+        iters=ITERS,
+        jobs=JOBS,
+        logger=logger,
+        verbose=False,
+        engine="numpy",
+    )
+    n = len(VALID_SEQ) + 1
+    q_unpaired, q_paired = np.ones((n, n)), np.zeros((n, n))
+    ref_unpaired, ref_paired = np.ones((n, n)), np.zeros((n, n))
+    # every single sweep has to match the reference engine exactly
+    for _ in range(ITERS):
+        q_unpaired, q_paired = calculator._calc_scores_numpy(
+            q_unpaired, q_paired, VALID_SEQ
+        )
+        ref_unpaired, ref_paired = calculator._calc_scores(
+            ref_unpaired, ref_paired, VALID_SEQ
+        )
+        np.testing.assert_array_equal(q_unpaired, ref_unpaired)
+        np.testing.assert_array_equal(q_paired, ref_paired)
+
+
+def test_get_structure_numpy():
+    calculator = McCaskill(
+        input=INPUT_PATH,
+        output=OUTPUT_PATH,
+        bp_energy_weight=BP_ENERGY_WEIGHT,
+        normalized_rt=NORMALIZED_RT,
+        min_loop_length=MIN_LOOP_LENGTH,
+        iters=ITERS,
+        jobs=JOBS,
+        logger=logger,
+        verbose=False,
+        engine="numpy",
+    )
+    seq, description, category, pdb_id, source, idx = list(
+        calculator._get_sequences_and_metadata()
+    )[1]
+    calculator._get_structure(seq, description, category, pdb_id, source, idx)
+    with open(
+        REF_PATH / "a.1.1.1" / "1ux8" / "gene" / "structure_1.json",
+        "rb",
+    ) as ref_file, open(
+        OUTPUT_PATH / "a.1.1.1" / "1ux8" / "gene" / "structure_1.json",
+        "rb",
+    ) as gen_file:
+        gen_data = json.load(gen_file)
+        ref_data = json.load(ref_file)
+        assert gen_data == ref_data
+    if Path(OUTPUT_PATH).exists():  # pragma: no cover
+        shutil.rmtree(OUTPUT_PATH)
+
+
+def test_create_tables_single_pass():
+    for engine in ["python", "numpy"]:
+        calculator = McCaskill(
+            input=INPUT_PATH,
+            output=OUTPUT_PATH,
+            bp_energy_weight=BP_ENERGY_WEIGHT,
+            normalized_rt=NORMALIZED_RT,
+            min_loop_length=MIN_LOOP_LENGTH,
+            iters=ITERS,
+            jobs=JOBS,
+            logger=logger,
+            verbose=False,
+            engine=engine,
+        )
+        single_pass_calculator = McCaskill(
+            input=INPUT_PATH,
+            output=OUTPUT_PATH,
+            bp_energy_weight=BP_ENERGY_WEIGHT,
+            normalized_rt=NORMALIZED_RT,
+            min_loop_length=MIN_LOOP_LENGTH,
+            iters=ITERS,
+            jobs=JOBS,
+            logger=logger,
+            verbose=False,
+            engine=engine,
+            single_pass=True,
+        )
+        # ITERS sweeps are enough for VALID_SEQ to converge
+        q_tables = calculator._create_scoring_tables(VALID_SEQ)
+        single_pass_q_tables = single_pass_calculator._create_scoring_tables(
+            VALID_SEQ
+        )
+        for table, single_pass_table in zip(q_tables, single_pass_q_tables):
+            np.testing.assert_array_equal(table, single_pass_table)
+        p_tables = calculator._create_probability_tables(*q_tables)
+        single_pass_p_tables = (
+            single_pass_calculator._create_probability_tables(
+                *single_pass_q_tables
+            )
+        )
+        for table, single_pass_table in zip(p_tables, single_pass_p_tables):
+            np.testing.assert_array_equal(table, single_pass_table)
+
+
+def test_get_structure_single_pass():
+    # the reference in REF_PATH is the result of ITERS sweeps, which
+    # is not converged for a sequence this long, so only its metadata
+    # is compared; the structure is compared with the converged
+    # reference (equal to running as many sweeps as there are bases)
+    for engine in ["python", "numpy"]:
+        calculator = McCaskill(
+            input=INPUT_PATH,
+            output=OUTPUT_PATH,
+            bp_energy_weight=BP_ENERGY_WEIGHT,
+            normalized_rt=NORMALIZED_RT,
+            min_loop_length=MIN_LOOP_LENGTH,
+            iters=ITERS,
+            jobs=JOBS,
+            logger=logger,
+            verbose=False,
+            engine=engine,
+            single_pass=True,
+        )
+        seq, description, category, pdb_id, source, idx = list(
+            calculator._get_sequences_and_metadata()
+        )[1]
+        calculator._get_structure(
+            seq, description, category, pdb_id, source, idx
+        )
+        with open(
+            REF_PATH / "a.1.1.1" / "1ux8" / "gene" / "structure_1.json",
+            "rb",
+        ) as ref_file, open(
+            SINGLE_PASS_REF_PATH
+            / "a.1.1.1"
+            / "1ux8"
+            / "gene"
+            / "structure_1.json",
+            "rb",
+        ) as single_pass_ref_file, open(
+            OUTPUT_PATH / "a.1.1.1" / "1ux8" / "gene" / "structure_1.json",
+            "rb",
+        ) as gen_file:
+            gen_data = json.load(gen_file)
+            ref_data = json.load(ref_file)
+            single_pass_ref_data = json.load(single_pass_ref_file)
+            for key in ["pdb_id", "category", "description", "seq"]:
+                assert gen_data[key] == ref_data[key]
+            assert gen_data == single_pass_ref_data
+        if Path(OUTPUT_PATH).exists():  # pragma: no cover
+            shutil.rmtree(OUTPUT_PATH)
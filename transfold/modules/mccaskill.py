@@ -41,6 +41,8 @@ class McCaskill(object):
         jobs: int,
         logger: Logger,
         verbose=False,
+        engine="python",
+        single_pass=False,
     ):
         self.input = input
         self.output = output
@@ -51,6 +53,8 @@ class McCaskill(object):
         self.jobs = jobs
         self.logger = logger
         self.verbose = verbose
+        self.engine = engine
+        self.single_pass = single_pass
 
     def _check_sequence(self, seq: str) -> bool:
         self.logger.info("Checking sequence")
@@ -76,21 +80,91 @@ class McCaskill(object):
     # for now cannot be sped up with numba
     # because it's a recursive formula
     def _calc_scores(
-        self, q_unpaired: np.ndarray, q_paired: np.ndarray, seq: str
+        self,
+        q_unpaired: np.ndarray,
+        q_paired: np.ndarray,
+        seq: str,
+        single_pass=False,
     ) -> tuple[np.ndarray, np.ndarray]:
-        for i, j in np.ndindex(q_unpaired.shape):
+        # a single pass has to visit the cells in dependency order
+        # (by increasing span) and score the pair closing (i, j)
+        # before it is used for q_unpaired[i][j]
+        cells = (
+            self._get_cells_by_span(len(seq))
+            if single_pass
+            else np.ndindex(q_unpaired.shape)
+        )
+        for i, j in cells:
             # 1-based indexing and skipping fields below diagonal
             if j == 0 or i == 0 or i > j:
                 continue
+            if single_pass:
+                q_paired[i][j] = self._calc_paired_score(q_unpaired, seq, i, j)
             ks = [k for k in range(i, j) if i <= k < j - self.min_loop_length]
             q_unpaired[i][j] = q_unpaired[i][j - 1] + np.sum(
                 [q_unpaired[i][k - 1] * q_paired[k][j] for k in ks]
             )
-            q_paired[i][j] = (
-                q_unpaired[i + 1][j - 1]
-                * np.exp(-self.bp_energy_weight / self.normalized_rt)
-                if self._check_pairing(seq[i - 1], seq[j - 1])
-                else 0
+            if not single_pass:
+                q_paired[i][j] = self._calc_paired_score(q_unpaired, seq, i, j)
+        return q_unpaired, q_paired
+
+    def _calc_paired_score(
+        self, q_unpaired: np.ndarray, seq: str, i: int, j: int
+    ) -> float:
+        return (
+            q_unpaired[i + 1][j - 1]
+            * np.exp(-self.bp_energy_weight / self.normalized_rt)
+            if self._check_pairing(seq[i - 1], seq[j - 1])
+            else 0
+        )
+
+    def _get_cells_by_span(
+        self, length: int, reverse=False
+    ) -> Generator[tuple[int, int], None, None]:
+        spans = range(length - 1, -1, -1) if reverse else range(length)
+        for span in spans:
+            for i in range(1, length - span + 1):
+                yield i, i + span
+
+    # same sweep as _calc_scores, but the table is filled one diagonal
+    # (span length j - i) at a time; cells on a diagonal only depend
+    # on shorter spans of the current sweep and on q_paired
+    # from the previous sweep, so each diagonal is a single
+    # vectorized dot product over precomputed index slices
+    def _calc_scores_numpy(
+        self,
+        q_unpaired: np.ndarray,
+        q_paired: np.ndarray,
+        seq: str,
+        single_pass=False,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        length = len(seq)
+        weight = np.exp(-self.bp_energy_weight / self.normalized_rt)
+        bases = np.array(list(seq))
+        pairs = np.zeros(q_paired.shape, dtype=bool)
+        for base1, base2 in [("A", "U"), ("G", "C"), ("G", "U")]:
+            pairs[1:, 1:] |= np.outer(bases == base1, bases == base2)
+            pairs[1:, 1:] |= np.outer(bases == base2, bases == base1)
+        # in a single pass both tables are read back as they are filled
+        q_unpaired_prev = q_unpaired if single_pass else q_unpaired.copy()
+        q_paired_prev = q_paired if single_pass else q_paired.copy()
+        for span in range(length):
+            i = np.arange(1, length - span + 1)
+            j = i + span
+            if span == 0:
+                q_paired[i, j] = 0
+            else:
+                q_paired[i, j] = np.where(
+                    pairs[i, j], q_unpaired_prev[i + 1, j - 1] * weight, 0
+                )
+            n_terms = max(0, min(span, span - self.min_loop_length))
+            if n_terms == 0:
+                q_unpaired[i, j] = q_unpaired[i, j - 1]
+                continue
+            ks = i[:, None] + np.arange(n_terms)[None, :]
+            q_unpaired[i, j] = q_unpaired[i, j - 1] + np.sum(
+                q_unpaired[i[:, None], ks - 1] * q_paired_prev[ks, j[:, None]],
+                axis=1,
             )
         return q_unpaired, q_paired
 
@@ -102,9 +176,15 @@ class McCaskill(object):
         n = len(seq) + 1
         q_unpaired = np.ones((n, n))
         q_paired = np.zeros((n, n))
-        for iteration in range(self.iters):
+        calc_scores = {
+            "python": self._calc_scores,
+            "numpy": self._calc_scores_numpy,
+        }[self.engine]
+        for iteration in range(1 if self.single_pass else self.iters):
             self.logger.debug(f"Iteration: {iteration + 1}")
-            q_unpaired, q_paired = self._calc_scores(q_unpaired, q_paired, seq)
+            q_unpaired, q_paired = calc_scores(
+                q_unpaired, q_paired, seq, single_pass=self.single_pass
+            )
             self.logger.debug(
                 f"q_unpaired:\n{q_paired.shape}"
                 f"\t{q_unpaired.round(2).tolist()}"
@@ -125,8 +205,16 @@ class McCaskill(object):
         p_paired: np.ndarray,
         q_unpaired: np.ndarray,
         q_paired: np.ndarray,
+        single_pass=False,
     ) -> tuple[np.ndarray, np.ndarray]:
-        for i, j in np.ndindex(p_unpaired.shape):
+        # a single pass visits the cells by decreasing span so that
+        # the enclosing pairs (k, l) are ready before (i, j)
+        cells = (
+            self._get_cells_by_span(len(q_unpaired) - 1, reverse=True)
+            if single_pass
+            else np.ndindex(p_unpaired.shape)
+        )
+        for i, j in cells:
             # 1-based indexing and skipping fields below diagonal
             if j == 0 or i == 0 or i > j:
                 continue
@@ -171,6 +259,35 @@ class McCaskill(object):
                 pass
         return p_unpaired, p_paired
 
+    # same as _calc_probabilities, but filled one diagonal at a time
+    # by decreasing span; the enclosing pair sums of the reference
+    # loop are always empty, so only the exterior term is left
+    def _calc_probabilities_numpy(
+        self,
+        p_unpaired: np.ndarray,
+        p_paired: np.ndarray,
+        q_unpaired: np.ndarray,
+        q_paired: np.ndarray,
+        single_pass=False,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        length = len(q_unpaired) - 1
+        # the last column is skipped (IndexError in the reference loop)
+        for span in range(length - 2, -1, -1):
+            i = np.arange(1, length - span)
+            j = i + span
+            p_paired[i, j] = (
+                q_unpaired[1, i - 1]
+                * q_paired[i, j]
+                * q_unpaired[j + 1, length]
+                / q_unpaired[1, length]
+            )
+            p_unpaired[i, j] = (
+                q_unpaired[1, i - 1]
+                * q_unpaired[j + 1, length]
+                / q_unpaired[1, length]
+            )
+        return p_unpaired, p_paired
+
     def _create_probability_tables(
         self,
         q_unpaired: np.ndarray,
@@ -179,10 +296,18 @@ class McCaskill(object):
         self.logger.debug("Calculating paired and unpaired probabilities")
         p_unpaired = np.zeros(q_unpaired.shape)
         p_paired = np.zeros(q_paired.shape)
-        for iteration in range(self.iters):
+        calc_probabilities = {
+            "python": self._calc_probabilities,
+            "numpy": self._calc_probabilities_numpy,
+        }[self.engine]
+        for iteration in range(1 if self.single_pass else self.iters):
             self.logger.debug(f"Iteration: {iteration + 1}")
-            p_unpaired, p_paired = self._calc_probabilities(
-                p_unpaired, p_paired, q_unpaired, q_paired
+            p_unpaired, p_paired = calc_probabilities(
+                p_unpaired,
+                p_paired,
+                q_unpaired,
+                q_paired,
+                single_pass=self.single_pass,
             )
             self.logger.debug(
                 f"p_unpaired:\n{p_paired.shape}"
@@ -275,10 +400,11 @@ class McCaskill(object):
         )
         self.logger.info(
             f"PARAMS:\n"
-            f"\n\tIterations: {self.iters}"
+            f"\n\tIterations: {1 if self.single_pass else self.iters}"
             f"\n\tBP energy weight: {self.bp_energy_weight}"
             f"\n\tNormalized RT: {self.normalized_rt}"
             f"\n\tMinimal loop length: {self.min_loop_length}"
+            f"\n\tEngine: {self.engine}"
             f"\n\tConcurrent jobs: {self.jobs}\n"
         )
         with ProcessPoolExecutor(max_workers=self.jobs) as executor:
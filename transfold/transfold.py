@@ -135,6 +135,20 @@ def cli(version):
     help="Number of iterations",
     type=int,
 )
+@click.option(
+    "--single-pass",
+    "-s",
+    is_flag=True,
+    default=False,
+    help="Fill tables once in dependency order instead of iterating",
+)
+@click.option(
+    "--engine",
+    "-e",
+    default="python",
+    help="Table filling engine",
+    type=click.Choice(["python", "numpy"]),
+)
 @click.option(
     "--jobs",
     "-j",
@@ -171,6 +185,8 @@ def run(
     normalized_rt,
     min_loop_length,
     iters,
+    single_pass,
+    engine,
     jobs,
     log,
     logging_level,
@@ -191,6 +207,8 @@ def run(
         jobs=jobs,
         logger=logger,
         verbose=verbose,
+        engine=engine,
+        single_pass=single_pass,
     )
     calculator.start()
 